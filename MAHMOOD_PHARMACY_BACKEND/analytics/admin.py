@@ -0,0 +1,31 @@
+from django.contrib import admin
+from django.db.models import Sum
+from .models import DailySignupStats
+
+
+@admin.register(DailySignupStats)
+class DailySignupStatsAdmin(admin.ModelAdmin):
+    """Read-only dashboard over the rollup table; never touches users_user."""
+    list_display = ('date', 'signups', 'verified', 'conversion')
+    date_hierarchy = 'date'
+    show_full_result_count = False
+
+    @admin.display(description='Verification conversion')
+    def conversion(self, obj):
+        return f'{obj.conversion_rate:.0%}'
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        if hasattr(response, 'context_data') and 'cl' in response.context_data:
+            totals = response.context_data['cl'].queryset.aggregate(signups=Sum('signups'), verified=Sum('verified'))
+            response.context_data['totals'] = totals
+        return response
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
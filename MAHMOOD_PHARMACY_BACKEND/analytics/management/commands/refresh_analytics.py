@@ -0,0 +1,54 @@
+from datetime import datetime, time, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from analytics.models import DailySignupStats, Watermark
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Incrementally refresh the daily signup rollups read by the admin dashboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lookback-days', type=int, default=7,
+            help="Always recompute this many recent days, so late OTP verifications are counted."
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        today = timezone.localdate(now)
+        start = today - timedelta(days=options['lookback_days'])
+
+        watermark = Watermark.objects.filter(name='signups').first()
+        if watermark is not None:
+            start = min(start, timezone.localdate(watermark.value))
+        else:
+            first_joined = User.objects.order_by('date_joined').values_list('date_joined', flat=True).first()
+            if first_joined is not None:
+                start = min(start, timezone.localdate(first_joined))
+
+        since = timezone.make_aware(datetime.combine(start, time.min))
+        rows = (
+            User.objects.filter(date_joined__gte=since, date_joined__lt=now)
+            .annotate(day=TruncDate('date_joined'))
+            .values('day')
+            .annotate(signups=Count('id'), verified=Count('id', filter=Q(is_active=True)))
+        )
+        stats = [DailySignupStats(date=r['day'], signups=r['signups'], verified=r['verified']) for r in rows]
+
+        with transaction.atomic():
+            DailySignupStats.objects.filter(date__gte=start).exclude(date__in=[s.date for s in stats]).delete()
+            DailySignupStats.objects.bulk_create(
+                stats,
+                update_conflicts=True,
+                unique_fields=['date'],
+                update_fields=['signups', 'verified', 'updated_at'],
+            )
+            Watermark.objects.update_or_create(name='signups', defaults={'value': now})
+
+        self.stdout.write(f"Refreshed {len(stats)} day(s) of signup stats from {start}.")
@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class DailySignupStats(models.Model):
+    """Per-day signup rollup maintained by `manage.py refresh_analytics`."""
+    date = models.DateField(unique=True)
+    signups = models.PositiveIntegerField(default=0)
+    verified = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name_plural = 'daily signup stats'
+
+    @property
+    def conversion_rate(self):
+        return self.verified / self.signups if self.signups else 0
+
+    def __str__(self):
+        return str(self.date)
+
+
+class Watermark(models.Model):
+    """Point up to which a rollup has been refreshed."""
+    name = models.CharField(max_length=64, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
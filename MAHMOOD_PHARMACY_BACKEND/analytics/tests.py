@@ -0,0 +1,60 @@
+import io
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from .models import DailySignupStats, Watermark
+
+User = get_user_model()
+
+
+class RefreshAnalyticsTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        for i, (days_ago, active) in enumerate([(30, True), (30, False), (1, True), (1, False), (1, False)]):
+            User.objects.create_user(
+                email=f'user{i}@example.com',
+                password='StrongPassword123!',
+                is_active=active,
+                date_joined=self.now - timedelta(days=days_ago),
+            )
+
+    def refresh(self):
+        call_command('refresh_analytics', stdout=io.StringIO())
+
+    def test_builds_daily_rollups_and_watermark(self):
+        self.refresh()
+        old = DailySignupStats.objects.get(date=timezone.localdate(self.now - timedelta(days=30)))
+        recent = DailySignupStats.objects.get(date=timezone.localdate(self.now - timedelta(days=1)))
+        self.assertEqual((old.signups, old.verified), (2, 1))
+        self.assertEqual((recent.signups, recent.verified), (3, 1))
+        self.assertTrue(Watermark.objects.filter(name='signups').exists())
+
+    def test_incremental_refresh_only_scans_recent_days(self):
+        self.refresh()
+        User.objects.filter(email='user3@example.com').update(is_active=True)  # Late verification
+        User.objects.filter(email='user1@example.com').update(is_active=True)  # Outside the lookback window
+
+        self.refresh()
+        recent = DailySignupStats.objects.get(date=timezone.localdate(self.now - timedelta(days=1)))
+        old = DailySignupStats.objects.get(date=timezone.localdate(self.now - timedelta(days=30)))
+        self.assertEqual(recent.verified, 2)
+        self.assertEqual(old.verified, 1)
+
+    def test_dashboard_reads_only_rollups(self):
+        self.refresh()
+        admin = User.objects.create_superuser(email='admin@example.com', password='StrongPassword123!')
+        self.client.force_login(admin)
+        url = reverse('admin:analytics_dailysignupstats_changelist')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['totals'], {'signups': 5, 'verified': 2})
+        self.assertContains(response, 'Verified: <strong>2</strong>')
+        rollup_reads = [q['sql'] for q in queries if 'FROM "users_user"' in q['sql'] and 'WHERE "users_user"."id" =' not in q['sql']]
+        self.assertEqual(rollup_reads, [])
@@ -0,0 +1,20 @@
+"""
+Admin app config that leaves ModelAdmin discovery to the first admin request
+(config/admin_urls.py) but still discovers them before the admin system
+checks run, so `check`, `runserver` and the tests validate every ModelAdmin.
+"""
+from django.contrib import admin
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.contrib.admin.checks import check_admin_app, check_dependencies
+from django.core import checks
+
+
+def check_discovered_admin_app(app_configs, **kwargs):
+    admin.autodiscover()
+    return check_admin_app(app_configs, **kwargs)
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    def ready(self):
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(check_discovered_admin_app, checks.Tags.admin)
@@ -0,0 +1,8 @@
+"""
+Admin URLconf, imported lazily from config/urls.py on the first admin request.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
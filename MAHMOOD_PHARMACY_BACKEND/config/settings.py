@@ -9,14 +9,15 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from .env file (explicit path, no directory search)
+if (BASE_DIR / '.env').exists():
+    from dotenv import load_dotenv
+    load_dotenv(BASE_DIR / '.env')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -34,7 +35,7 @@ ALLOWED_HOSTS = ['10.0.2.2', '127.0.0.1', 'localhost']
 
 INSTALLED_APPS = [
     'jazzmin', # Added for custom admin panel
-    'django.contrib.admin',
+    'config.admin_apps.LazyAdminConfig', # ModelAdmins are discovered on the first admin request or system check
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -43,11 +44,17 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
+    'core',
     'users',
+    'analytics',
+    'notifications',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.PrecompressedStaticMiddleware',
+    'core.middleware.ThresholdGZipMiddleware',
+    'core.middleware.AdmissionControlMiddleware',
     'django.middleware.security.SecurityMiddleware',
 
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -78,6 +85,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Paths resolved by core.startup.prewarm() before a worker accepts traffic
+PREWARM_PATHS = ['/api/users/profile/']
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -136,6 +146,46 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic writes content-hashed names plus .gz/.br variants (core.storage)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# Serve STATIC_ROOT from Django with precompressed variants and immutable caching
+# (leave off when the web server maps /static/ itself)
+SERVE_STATIC = os.getenv('SERVE_STATIC', '0') == '1'
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+
+
+# Logging
+# App loggers write JSON lines through a queue so handler I/O happens off the
+# request thread; the chatty auth paths keep only a sample of DEBUG/INFO records.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'core.log.JsonFormatter'},
+    },
+    'filters': {
+        'auth_sampling': {'()': 'core.log.SamplingFilter', 'rate': float(os.getenv('AUTH_LOG_SAMPLE_RATE', '0.1'))},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'json'},
+        'queue': {'()': 'core.log.QueueListenerHandler', 'handlers': ['console']},
+    },
+    'loggers': {
+        'core': {'handlers': ['queue'], 'level': LOG_LEVEL, 'propagate': False},
+        'users': {'handlers': ['queue'], 'level': LOG_LEVEL, 'propagate': False},
+        'users.views': {'filters': ['auth_sampling']},
+        'users.serializers': {'filters': ['auth_sampling']},
+    },
+}
+
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -160,6 +210,54 @@ REST_FRAMEWORK = {
     }
 }
 
+# Cache (throttling, profile read model). Use a shared backend in production so
+# invalidation on write reaches every worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Seconds a cached profile may be served; also bounds staleness on per-process caches
+PROFILE_CACHE_TIMEOUT = 300
+
+# Admission control (core.middleware): per-process concurrency limits per route
+# group, in priority order. Over-limit requests wait up to queue_timeout seconds
+# (minus time already spent in the proxy queue, from X-Request-Start) and are
+# then shed with 503. Anonymous requests may use only ADMISSION_ANONYMOUS_SHARE
+# of each group's slots.
+ADMISSION_CONTROL = {
+    'auth': {'prefixes': ['/api/auth/'], 'limit': 8, 'queue_timeout': 0.5},
+    'admin': {'prefixes': ['/admin/'], 'limit': 2, 'queue_timeout': 1.0},
+    'api': {'prefixes': ['/api/'], 'limit': 16, 'queue_timeout': 0.25},
+}
+ADMISSION_ANONYMOUS_SHARE = 0.75
+ADMISSION_RETRY_AFTER = 2
+
+# Idempotency-Key support (core.idempotency): how long stored responses are
+# replayed, how long a retry waits on an in-flight first attempt, and after how
+# long an unfinished attempt counts as abandoned (seconds; keep it above the
+# worker timeout). Clients must send a fresh UUID per operation: anonymous
+# endpoints such as register share one key namespace.
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_WAIT_TIMEOUT = 5
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# Notifications (notifications.dispatcher): transport class, users per batch,
+# seconds a burst is held so it can be merged, delivery attempts before giving up
+NOTIFICATION_TRANSPORT = 'notifications.transports.EmailTransport'
+NOTIFICATION_BATCH_SIZE = 200
+NOTIFICATION_COALESCE_SECONDS = 60
+NOTIFICATION_MAX_ATTEMPTS = 5
+
+# Batch endpoint (api/batch/): sub-requests per call and threads for concurrent
+# reads. With 1, every sub-request reuses the request's DB connection; above 1,
+# each concurrent read opens (and closes) its own connection, which only pays
+# off when the reads are slower than a connection setup to the database.
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '1'))
+
 from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -234,6 +332,8 @@ JAZZMIN_SETTINGS = {
         "auth.user": "fas fa-user",
         "auth.Group": "fas fa-users",
         "users.User": "fas fa-user", # Custom icon for your User model
+        "analytics.DailySignupStats": "fas fa-chart-line",
+        "notifications.Notification": "fas fa-bell",
     },
     # Icons that are used when one is not manually specified
     "default_icon_parents": "fas fa-chevron-circle-right",
@@ -14,11 +14,14 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
 from django.urls import path, include
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    # Passing the URLconf by name keeps the admin (and its ModelAdmin imports) out of
+    # the worker until the first /admin/ request.
+    path('admin/', ('config.admin_urls', 'admin', 'admin')),
+    path('api/', include('core.urls')),
     path('api/', include('users.urls')),
+    path('api/', include('notifications.urls')),
 ]
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Load the API URLconf and ORM before the worker accepts traffic
+if os.environ.get('WSGI_PREWARM', '1') == '1':
+    from core.startup import prewarm
+    prewarm()
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.http import QueryDict
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+POLL_INTERVAL = 0.1
+
+
+def _canonical(value):
+    """
+    A JSON-serializable form of parsed request data that doesn't depend on the
+    encoding: multipart boundaries and key order don't change it, uploads are
+    reduced to name, size and content hash.
+    """
+    if isinstance(value, UploadedFile):
+        digest = hashlib.sha256()
+        for chunk in value.chunks():
+            digest.update(chunk)
+        value.seek(0)  # Leave the upload readable for the view
+        return {'name': value.name, 'size': value.size, 'sha256': digest.hexdigest()}
+    if isinstance(value, QueryDict):
+        return {key: [_canonical(v) for v in value.getlist(key)] for key in value}
+    if isinstance(value, dict):
+        return {str(key): _canonical(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def _request_hash(request):
+    payload = json.dumps(_canonical(request.data), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """
+    Decorator for unsafe APIView handlers. When the client sends an
+    Idempotency-Key header, the first execution's response is stored and
+    returned to every retry without running the handler again. Keys are
+    scoped per user, but anonymous callers share one namespace, so clients
+    must send a freshly generated UUID per operation rather than a guessable
+    value. A retry that
+    arrives while the first execution is still running waits for it; an
+    execution still unfinished after IDEMPOTENCY_LOCK_TIMEOUT is treated as
+    abandoned (its worker died) and the retry takes over. 5xx responses and
+    exceptions are not stored, so the client can retry them.
+    """
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return handler(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"error": f"{IDEMPOTENCY_HEADER} must be at most 255 characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        user_id = request.user.pk if request.user.is_authenticated else ''
+        scope = hashlib.sha256(f'{user_id}:{request.method}:{request.path}:{key}'.encode()).hexdigest()
+        request_hash = _request_hash(request)
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        while True:
+            try:
+                with transaction.atomic():
+                    record = IdempotencyRecord.objects.create(
+                        scope=scope,
+                        request_hash=request_hash,
+                        expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                    )
+                break
+            except IntegrityError:
+                existing = IdempotencyRecord.objects.filter(scope=scope).first()
+
+            if existing is None:
+                continue  # Removed by a failed first attempt; claim it
+            now = timezone.now()
+            abandoned = (existing.status == IdempotencyRecord.IN_PROGRESS
+                         and existing.created_at <= now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT))
+            if existing.expires_at <= now or abandoned:
+                existing.delete()
+                continue
+            if existing.request_hash != request_hash:
+                return Response({"error": f"{IDEMPOTENCY_HEADER} was already used for a different request."},
+                                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if existing.status == IdempotencyRecord.COMPLETED:
+                return _replay(existing)
+            if time.monotonic() >= deadline:
+                return Response({"error": "A request with this Idempotency-Key is still being processed."},
+                                status=status.HTTP_409_CONFLICT)
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            response = handler(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if response.status_code >= 500 or not hasattr(response, 'data'):
+            record.delete()
+            return response
+
+        # A no-op if a retry took the record over after IDEMPOTENCY_LOCK_TIMEOUT
+        IdempotencyRecord.objects.filter(pk=record.pk).update(
+            status=IdempotencyRecord.COMPLETED,
+            response_status=response.status_code,
+            response_body=response.data,
+        )
+        return response
+    return wrapper
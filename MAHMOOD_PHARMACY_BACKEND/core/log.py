@@ -0,0 +1,114 @@
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra=` fields."""
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update((k, v) for k, v in vars(record).items() if k not in _RECORD_ATTRS)
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room instead of raising queue.Full when stopping behind a backlog
+        self.queue.put(self._sentinel)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Enqueue records on the calling thread and write them from a background
+    QueueListener, so request threads never block on handler I/O.
+
+    `handlers` names handlers from the same LOGGING config; they are resolved
+    on the first record, once dictConfig has built all of them. The listener
+    is restarted in a forked worker, whose copy of the parent's thread is
+    dead. Records shed on a full queue are counted and reported as a warning
+    once there is room again.
+    """
+    def __init__(self, handlers, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.handler_names = handlers
+        self.listener = None
+        self.pid = None
+        self.dropped = 0
+        atexit.register(self.close)
+
+    def _start(self):
+        if self.pid is not None:
+            # Forked from a process that had already started the listener: the
+            # thread didn't survive and the queue's lock may be held, so start over
+            self.queue = queue.Queue(self.queue.maxsize)
+        targets = [logging._handlers[name] for name in self.handler_names]
+        self.listener = _Listener(self.queue, *targets, respect_handler_level=True)
+        self.listener.start()
+        self.pid = os.getpid()
+
+    def prepare(self, record):
+        # Records never leave the process, so only the message is frozen here;
+        # formatting and traceback rendering happen on the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        # Called under the handler lock, so the counters need no extra locking
+        if self.pid != os.getpid():
+            self._start()
+        try:
+            if self.dropped:
+                self._report_dropped()
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1  # Shed log records rather than stall the request
+
+    def _report_dropped(self, block=False):
+        record = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': "%d log records were dropped because the log queue was full", 'args': (self.dropped,),
+        })
+        self.queue.put(self.prepare(record), block=block)
+        self.dropped = 0
+
+    def close(self):
+        if self.listener is not None and self.pid == os.getpid():
+            if self.dropped:
+                self._report_dropped(block=True)
+            self.listener.stop()
+            self.listener = None
+            self.pid = None
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every `1 / rate` records below WARNING; WARNING and above
+    always pass.
+    """
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.counter = itertools.count()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+        return next(self.counter) % self.every == 0
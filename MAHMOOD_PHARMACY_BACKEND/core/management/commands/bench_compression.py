@@ -0,0 +1,66 @@
+import gzip
+import time
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from core.storage import COMPRESSIBLE_EXTENSIONS, brotli
+
+
+class Command(BaseCommand):
+    help = "Compare bytes on the wire and CPU cost of gzip/brotli for static bundles and large API payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Rows in the synthetic user list payload.")
+        parser.add_argument('--files', type=int, default=8, help="Largest static files to include.")
+
+    def _static_payloads(self, limit):
+        files = {}
+        for finder in finders.get_finders():
+            for path, storage in finder.list([]):
+                if path.endswith(COMPRESSIBLE_EXTENSIONS) and path not in files:
+                    with storage.open(path) as f:
+                        files[path] = f.read()
+        return sorted(files.items(), key=lambda item: len(item[1]), reverse=True)[:limit]
+
+    def _user_list_payload(self, count):
+        rows = [
+            {'email': f'customer{i}@example.com', 'first_name': 'Customer', 'last_name': f'Number {i}',
+             'mobile': f'+92300{i:07d}'}
+            for i in range(count)
+        ]
+        return JSONRenderer().render(rows)
+
+    def _measure(self, compress, data, repeat=3):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = compress(data)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None or elapsed < best else best
+        return len(out), best * 1000
+
+    def handle(self, *args, **options):
+        codecs = [
+            ('gzip-6 (response)', lambda d: gzip.compress(d, compresslevel=6, mtime=0)),
+            ('gzip-9 (collectstatic)', lambda d: gzip.compress(d, compresslevel=9, mtime=0)),
+        ]
+        if brotli is not None:
+            codecs.append(('brotli-11 (collectstatic)', lambda d: brotli.compress(d, quality=11)))
+        else:
+            self.stdout.write("brotli is not installed; only gzip is measured.")
+
+        payloads = self._static_payloads(options['files'])
+        payloads.append((f"api/users/ ({options['users']} rows)", self._user_list_payload(options['users'])))
+
+        self.stdout.write(f"{'payload':<48} {'codec':<26} {'bytes':>10} {'ratio':>7} {'ms':>8}")
+        totals = {}
+        for name, data in payloads:
+            self.stdout.write(f"{name[-48:]:<48} {'identity':<26} {len(data):>10} {1:>7.2f} {0:>8.2f}")
+            totals.setdefault('identity', 0)
+            totals['identity'] += len(data)
+            for label, compress in codecs:
+                size, ms = self._measure(compress, data)
+                totals[label] = totals.get(label, 0) + size
+                self.stdout.write(f"{'':<48} {label:<26} {size:>10} {size / len(data):>7.2f} {ms:>8.2f}")
+
+        self.stdout.write("Total bytes on the wire: " + ", ".join(f"{k}={v}" for k, v in totals.items()))
@@ -0,0 +1,86 @@
+import logging
+import os
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from core.log import JsonFormatter, QueueListenerHandler, SamplingFilter
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-call and per-request logging overhead on the request thread."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+        parser.add_argument('--calls-per-request', type=int, default=6,
+                            help="Log calls on a typical login request (serializer + view).")
+        parser.add_argument('--sink-latency-us', type=int, default=0,
+                            help="Delay added to each write, modelling a blocked stderr pipe or log collector.")
+
+    def _time(self, fn, iterations):
+        start = time.perf_counter_ns()
+        for i in range(iterations):
+            fn(i)
+        return (time.perf_counter_ns() - start) / iterations
+
+    def _handler(self, path, latency):
+        handler = logging.FileHandler(path)
+        handler.setFormatter(JsonFormatter())
+        if latency:
+            emit = handler.emit
+
+            def slow_emit(record):
+                time.sleep(latency)
+                emit(record)
+            handler.emit = slow_emit
+        return handler
+
+    def _logger(self, name, handler=None, level=logging.INFO, filters=()):
+        logger = logging.getLogger(f'bench.{name}')
+        logger.handlers = [handler] if handler else []
+        logger.filters = list(filters)
+        logger.setLevel(level)
+        logger.propagate = False
+        return logger
+
+    def handle(self, *args, **options):
+        n = options['iterations']
+        email = 'customer@example.com'
+        results = []
+
+        disabled = self._logger('disabled', logging.NullHandler())
+        results.append(('DEBUG off, f-string', self._time(
+            lambda i: disabled.debug(f"[Serializer] Starting validation for email: {email} {i}"), n)))
+        results.append(('DEBUG off, lazy args', self._time(
+            lambda i: disabled.debug("[Serializer] Starting validation for email: %s %s", email, i), n)))
+
+        latency = options['sink_latency_us'] / 1e6
+        fd, path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        try:
+            direct_handler = self._handler(path, latency)
+            direct = self._logger('direct', direct_handler)
+            results.append(('INFO on, synchronous file handler', self._time(
+                lambda i: direct.info("Login attempt for %s %s", email, i), n)))
+
+            target = self._handler(path, latency)
+            target.name = 'bench_target'
+            queued_handler = QueueListenerHandler(['bench_target'], maxsize=0)
+            queued = self._logger('queued', queued_handler)
+            results.append(('INFO on, queue handler', self._time(
+                lambda i: queued.info("Login attempt for %s %s", email, i), n)))
+
+            sampled = self._logger('sampled', queued_handler, filters=[SamplingFilter(0.1)])
+            results.append(('INFO on, queue handler, 10% sampling', self._time(
+                lambda i: sampled.info("Login attempt for %s %s", email, i), n)))
+
+            queued_handler.close()
+            direct_handler.close()
+            target.close()
+            logging._handlers.pop('bench_target', None)
+        finally:
+            os.remove(path)
+
+        calls = options['calls_per_request']
+        self.stdout.write(f"{'scenario':<42} {'ns/call':>10} {'us/request':>11}")
+        for label, ns in results:
+            self.stdout.write(f"{label:<42} {ns:>10.0f} {ns * calls / 1000:>11.2f}")
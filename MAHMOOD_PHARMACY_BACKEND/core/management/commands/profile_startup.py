@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already in sys.modules.
+FIRST_RESPONSE_SCRIPT = """
+import json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+from config.wsgi import application
+t1 = time.perf_counter()
+environ = {'PATH_INFO': sys.argv[1]}
+setup_testing_defaults(environ)
+statuses = []
+body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+b''.join(body)
+body.close()
+t2 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'first_response': t2 - t1, 'status': statuses[0]}))
+"""
+
+
+def parse_importtime(output):
+    """
+    Parse `python -X importtime` stderr into (module, self_us, cumulative_us)
+    tuples, in import order.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header row
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time of the WSGI entry point and time to first response."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help="Number of modules to list.")
+        parser.add_argument('--sort', choices=['self', 'cumulative'], default='cumulative')
+        parser.add_argument('--first-response', action='store_true',
+                            help="Also benchmark a cold worker's first request, with and without prewarm.")
+        parser.add_argument('--path', default='/api/users/profile/', help="Path requested by --first-response.")
+        parser.add_argument('--runs', type=int, default=3)
+
+    def _run(self, args, env=None):
+        result = subprocess.run(
+            [sys.executable] + args,
+            cwd=settings.BASE_DIR,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE='config.settings', **(env or {})),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "Subprocess failed")
+        return result
+
+    def handle(self, *args, **options):
+        result = self._run(['-X', 'importtime', '-c', 'import config.wsgi'], env={'WSGI_PREWARM': '0'})
+        rows = parse_importtime(result.stderr)
+        total = sum(row[1] for row in rows)
+        key = 1 if options['sort'] == 'self' else 2
+
+        self.stdout.write(f"{'module':<60} {'self ms':>9} {'cum ms':>9}")
+        for module, self_us, cumulative_us in sorted(rows, key=lambda r: r[key], reverse=True)[:options['limit']]:
+            self.stdout.write(f"{module:<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+        self.stdout.write(f"{len(rows)} modules, {total / 1000:.1f} ms total import time")
+
+        if options['first_response']:
+            for prewarm in ('0', '1'):
+                samples = [
+                    json.loads(self._run(['-c', FIRST_RESPONSE_SCRIPT, options['path']],
+                                         env={'WSGI_PREWARM': prewarm}).stdout)
+                    for _ in range(options['runs'])
+                ]
+                best = min(samples, key=lambda s: s['import'] + s['first_response'])
+                self.stdout.write(
+                    f"prewarm={prewarm}: import {best['import'] * 1000:.1f} ms, "
+                    f"first response {best['first_response'] * 1000:.1f} ms ({best['status']})"
+                )
@@ -0,0 +1,248 @@
+import mimetypes
+import os
+import threading
+import time
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404, JsonResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Route groups of this process, rebuilt when the middleware is loaded
+_groups = {}
+
+
+class RouteGroup:
+    """
+    Concurrency limit for one route group. Requests over the limit wait up to
+    `queue_timeout` seconds for a slot, minus the time they already spent
+    queued in front of Django; a request that used up that budget upstream is
+    shed even when a slot is free. Anonymous requests may only use
+    `anonymous_share` of the slots so authenticated traffic keeps headroom.
+    """
+    def __init__(self, name, prefixes, limit, queue_timeout=0.0, max_queue=None, anonymous_share=1.0):
+        self.name = name
+        self.prefixes = tuple(prefixes)
+        self.limit = limit
+        self.anonymous_limit = max(1, int(limit * anonymous_share))
+        self.queue_timeout = queue_timeout
+        self.max_queue = limit if max_queue is None else max_queue
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def acquire(self, authenticated, waited=0.0):
+        capacity = self.limit if authenticated else self.anonymous_limit
+        budget = self.queue_timeout - waited
+        with self.condition:
+            if waited and budget <= 0:
+                # The client has likely given up already; don't spend a slot on it
+                self.shed += 1
+                return False
+            if self.in_flight < capacity:
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if budget <= 0 or self.waiting >= self.max_queue:
+                self.shed += 1
+                return False
+            self.waiting += 1
+            try:
+                admitted = self.condition.wait_for(lambda: self.in_flight < capacity, timeout=budget)
+            finally:
+                self.waiting -= 1
+            if admitted:
+                self.in_flight += 1
+                self.admitted += 1
+            else:
+                self.shed += 1
+            return admitted
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            # Waiters have different capacities, so wake them all to re-check
+            self.condition.notify_all()
+
+    def snapshot(self):
+        with self.condition:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'queue_depth': self.waiting,
+                'admitted': self.admitted,
+                'shed': self.shed,
+            }
+
+
+def admission_snapshot():
+    """Per-group counters of this worker process."""
+    return {name: group.snapshot() for name, group in _groups.items()}
+
+
+def route_group(path):
+    """The route group limiting `path`: first matching prefix wins, None if unlimited."""
+    return next((g for g in _groups.values() if path.startswith(g.prefixes)), None)
+
+
+def overloaded_response():
+    response = JsonResponse({"error": "Server is busy. Please retry shortly.", "code": "overloaded"}, status=503)
+    response['Retry-After'] = str(getattr(settings, 'ADMISSION_RETRY_AFTER', 1))
+    return response
+
+
+def has_valid_access_token(request):
+    """
+    Whether the request carries a bearer access token with a valid signature
+    and expiry. Checked without touching the DB; the view still authenticates.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not header.startswith('Bearer '):
+        return False
+    try:
+        AccessToken(header[len('Bearer '):].strip())
+    except TokenError:
+        return False
+    return True
+
+
+def upstream_queue_time(request):
+    """
+    Seconds the request waited in front of Django, from the proxy's
+    X-Request-Start header ("t=<seconds|ms|us>"), or 0 if absent.
+    """
+    value = request.META.get('HTTP_X_REQUEST_START', '').removeprefix('t=')
+    try:
+        started = float(value)
+    except ValueError:
+        return 0.0
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, time.time() - started)
+
+
+class AdmissionControlMiddleware:
+    """
+    Shed load per route group before any authentication, DB or hashing work:
+    requests get 503 with Retry-After once their queue-time budget is spent,
+    upstream or waiting for a slot. Only a correctly signed, unexpired access
+    token counts as authenticated for the anonymous share. Groups come from
+    settings.ADMISSION_CONTROL; first matching prefix wins and unmatched
+    paths are not limited.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        share = getattr(settings, 'ADMISSION_ANONYMOUS_SHARE', 1.0)
+        _groups.clear()
+        for name, options in getattr(settings, 'ADMISSION_CONTROL', {}).items():
+            _groups[name] = RouteGroup(name, anonymous_share=share, **options)
+
+    def __call__(self, request):
+        group = route_group(request.path_info)
+        if group is None:
+            return self.get_response(request)
+
+        if not group.acquire(has_valid_access_token(request), upstream_queue_time(request)):
+            return overloaded_response()
+        try:
+            return self.get_response(request)
+        finally:
+            group.release()
+
+
+def accepted_encodings(header):
+    """
+    Map each content-coding in an Accept-Encoding header to its q-value, so
+    "gzip;q=0" reads as a refusal rather than a match.
+    """
+    codings = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.lower()] = q
+    return codings
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Serve collected static files (settings.SERVE_STATIC) straight from
+    STATIC_ROOT, choosing the .br or .gz variant written at collectstatic
+    time when the client accepts it. Content-hashed names are cached as
+    immutable for a year; anything else is revalidated after a minute.
+    """
+    encodings = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'SERVE_STATIC', False) and bool(settings.STATIC_ROOT)
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+
+    def __call__(self, request):
+        if not self.enabled or not request.path_info.startswith(self.prefix):
+            return self.get_response(request)
+        if request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+
+        name = request.path_info[len(self.prefix):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except ValueError:
+            raise Http404("Invalid static path")
+        if not os.path.isfile(path):
+            return self.get_response(request)
+
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        served, encoding = path, None
+        for candidate, suffix in self.encodings:
+            if accepted.get(candidate, accepted.get('*', 0)) > 0 and os.path.isfile(path + suffix):
+                served, encoding = path + suffix, candidate
+                break
+
+        content_type, _ = mimetypes.guess_type(path)
+        # Name the decoded file, not the .gz/.br variant actually read
+        response = FileResponse(open(served, 'rb'), content_type=content_type or 'application/octet-stream',
+                                filename=os.path.basename(path))
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if self._is_hashed(name):
+            response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+    def _is_hashed(self, name):
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+        if not hashed_files:
+            return False
+        if not hasattr(self, '_hashed_names'):
+            self._hashed_names = frozenset(hashed_files.values())
+        return name in self._hashed_names
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware limited to buffered responses of at least
+    settings.COMPRESS_MIN_SIZE bytes. Small JSON isn't worth the CPU and
+    file downloads are left alone.
+    """
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < getattr(settings, 'COMPRESS_MIN_SIZE', 1024):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,24 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Outcome of one request sent with an Idempotency-Key header. `scope` hashes
+    the key together with the user, method and path; `request_hash` hashes
+    the body so a reused key with a different payload is rejected.
+    """
+    IN_PROGRESS = 'in_progress'
+    COMPLETED = 'completed'
+    STATUS_CHOICES = [(IN_PROGRESS, 'In progress'), (COMPLETED, 'Completed')]
+
+    scope = models.CharField(max_length=64, unique=True)
+    request_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=IN_PROGRESS)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.scope} ({self.status})'
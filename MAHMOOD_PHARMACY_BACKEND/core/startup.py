@@ -0,0 +1,31 @@
+import logging
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.urls import Resolver404, get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm():
+    """
+    Resolve the hot API paths and run a trivial query on every database so the
+    first real request doesn't pay for URLconf, view, serializer and ORM imports.
+    Connections are closed afterwards so a preloading master never shares a
+    socket with its forked workers.
+    """
+    resolver = get_resolver()
+    for path in getattr(settings, 'PREWARM_PATHS', []):
+        try:
+            resolver.resolve(path)
+        except Resolver404:
+            logger.warning("Prewarm path %s did not resolve", path)
+
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+    try:
+        for alias in connections:
+            User.objects.using(alias).filter(pk=0).exists()
+    except DatabaseError as e:
+        logger.warning("Prewarm query failed: %s", e)
+    finally:
+        connections.close_all()
@@ -0,0 +1,57 @@
+import gzip
+import os
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ttf', '.eot')
+# Smaller files aren't worth a second request path or the extra syscalls
+MIN_COMPRESS_SIZE = 512
+
+
+def compress_file(path):
+    """Write `path`.gz (and `path`.br when brotli is installed) next to `path`; return the variants written."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if len(content) < MIN_COMPRESS_SIZE:
+        return []
+
+    written = []
+    variants = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    for suffix, compress in variants:
+        compressed = compress(content)
+        if len(compressed) < len(content):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Content-hashed static files plus precompressed .gz/.br siblings of every
+    compressible file, written once at collectstatic time and served by
+    core.middleware.PrecompressedStaticMiddleware.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not collected yet (dev, tests): link the unhashed name
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                for variant in compress_file(self.path(name)):
+                    yield os.path.relpath(variant, self.location), variant, True
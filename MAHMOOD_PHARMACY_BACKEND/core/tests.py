@@ -0,0 +1,439 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import logging
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core import checks
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.client import encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+from .idempotency import idempotent
+from .log import JsonFormatter, QueueListenerHandler, SamplingFilter
+from .management.commands.profile_startup import parse_importtime
+from .middleware import _groups
+from .models import IdempotencyRecord
+from .storage import compress_file
+from .startup import prewarm
+
+class StartupTests(TestCase):
+    def test_parse_importtime_skips_header_and_noise(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "some other stderr line\n"
+            "import time:       300 |       5000 | config.wsgi\n"
+        )
+        self.assertEqual(parse_importtime(output), [('_io', 120, 120), ('config.wsgi', 300, 5000)])
+
+    @override_settings(PREWARM_PATHS=['/api/users/profile/', '/does-not-exist/'])
+    def test_prewarm_tolerates_unknown_paths(self):
+        with self.assertLogs('core.startup', level='WARNING') as logs:
+            prewarm()
+        self.assertIn('/does-not-exist/', logs.output[0])
+
+    def test_lazy_admin_urlconf_still_serves_admin(self):
+        response = self.client.get(reverse('admin:login'))
+        self.assertEqual(response.status_code, 200)
+
+    @patch('users.admin.CustomUserAdmin.list_display', ('no_such_field',))
+    def test_system_checks_still_validate_model_admins(self):
+        errors = checks.run_checks(tags=[checks.Tags.admin])
+        self.assertIn('admin.E108', [e.id for e in errors])
+
+
+class LoggingTests(SimpleTestCase):
+    def test_json_formatter_includes_extra_fields(self):
+        record = logging.makeLogRecord({'name': 'users.views', 'levelno': logging.INFO, 'levelname': 'INFO',
+                                        'msg': 'Login for %s', 'args': ('a@example.com',), 'route': 'auth'})
+        payload = json.loads(JsonFormatter().format(record))
+        self.assertEqual(payload['message'], 'Login for a@example.com')
+        self.assertEqual(payload['route'], 'auth')
+
+    def test_sampling_filter_keeps_warnings(self):
+        sampling = SamplingFilter(rate=0.25)
+        debug = [sampling.filter(logging.makeLogRecord({'levelno': logging.DEBUG})) for _ in range(8)]
+        self.assertEqual(debug.count(True), 2)
+        self.assertTrue(sampling.filter(logging.makeLogRecord({'levelno': logging.WARNING})))
+
+    def test_queue_handler_writes_off_thread(self):
+        records = []
+
+        class Collect(logging.Handler):
+            def emit(self, record):
+                records.append((record.getMessage(), threading.current_thread()))
+
+        target = Collect()
+        target.name = 'test_collect'
+        handler = QueueListenerHandler(['test_collect'])
+        logger = logging.getLogger('core.tests.queue')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.warning("Queued %s", 'message')
+        finally:
+            logger.removeHandler(handler)
+            handler.close()  # Drains the queue
+            logging._handlers.pop('test_collect', None)
+        self.assertEqual(records[0][0], 'Queued message')
+        self.assertIsNot(records[0][1], threading.current_thread())
+
+    def _collecting_handler(self, maxsize=10000, block=None):
+        records = []
+
+        class Collect(logging.Handler):
+            def emit(self, record):
+                records.append(record.getMessage())
+                if block is not None and len(records) == 1:
+                    block.wait(5)
+
+        self.target = Collect()  # logging._handlers only holds weak references
+        self.target.name = 'test_collect'
+        self.addCleanup(logging._handlers.pop, 'test_collect', None)
+        handler = QueueListenerHandler(['test_collect'], maxsize=maxsize)
+        logger = logging.getLogger('core.tests.queue')
+        logger.addHandler(handler)
+        logger.propagate = False
+        self.addCleanup(logger.removeHandler, handler)
+        return logger, handler, records
+
+    def _wait_until_drained(self, handler, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not handler.queue.empty():
+            if time.monotonic() > deadline:
+                self.fail("Log listener stopped draining the queue")
+            time.sleep(0.01)
+
+    def test_listener_restarts_in_forked_worker(self):
+        logger, handler, records = self._collecting_handler()
+        logger.warning("Before fork")
+        parent_listener = handler.listener
+        parent_listener.stop()  # The thread doesn't survive a fork
+        with patch('core.log.os.getpid', return_value=os.getpid() + 1):
+            logger.warning("After fork")
+            self.assertIsNot(handler.listener, parent_listener)
+            handler.close()
+        self.assertEqual(records, ["Before fork", "After fork"])
+
+    def test_dropped_records_are_reported(self):
+        release = threading.Event()
+        logger, handler, records = self._collecting_handler(maxsize=2, block=release)
+        logger.warning("first")  # Taken by the listener, which then blocks
+        self._wait_until_drained(handler)
+        for message in ("second", "third", "fourth", "fifth"):
+            logger.warning(message)
+        self.assertEqual(handler.dropped, 2)
+        release.set()
+        self._wait_until_drained(handler)
+        logger.warning("sixth")
+        handler.close()
+        self.assertEqual(records, ["first", "second", "third",
+                                   "2 log records were dropped because the log queue was full", "sixth"])
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('batch')
+        self.user = get_user_model().objects.create_user(
+            email='batch@example.com', password='StrongPassword123!', first_name='Batch'
+        )
+
+    def test_runs_sub_requests_as_the_batch_user(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, {'requests': [
+            {'method': 'PATCH', 'path': 'users/profile/', 'body': {'first_name': 'Updated'}},
+            {'method': 'GET', 'path': '/api/users/profile/'},
+            {'method': 'GET', 'path': 'users/'},
+            {'method': 'GET', 'path': 'nope/'},
+            {'method': 'POST', 'path': 'batch/', 'body': {'requests': []}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        statuses = [r['status'] for r in response.data['responses']]
+        self.assertEqual(statuses, [200, 200, 403, 404, 400])
+        self.assertEqual(response.data['responses'][1]['body']['first_name'], 'Updated')
+
+    @override_settings(BATCH_MAX_WORKERS=4)
+    def test_concurrent_reads_keep_request_order(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, {'requests': [
+            {'path': 'users/profile/'},
+            {'path': 'users/profile/?fields=all'},
+            {'path': 'users/profile/'},
+        ]}, format='json')
+        bodies = [r['body'] for r in response.data['responses']]
+        self.assertEqual([b['email'] for b in bodies], ['batch@example.com'] * 3)
+
+    def test_reads_share_the_request_connection_by_default(self):
+        self.client.force_authenticate(self.user)
+        with patch('core.views.connections.close_all') as close_all:
+            response = self.client.post(self.url, {'requests': [
+                {'path': 'users/profile/'}, {'path': 'users/profile/'},
+            ]}, format='json')
+        self.assertEqual([r['status'] for r in response.data['responses']], [200, 200])
+        close_all.assert_not_called()
+
+    @patch('users.views.UserProfileView.retrieve', side_effect=RuntimeError('boom'))
+    def test_unexpected_error_fails_only_its_entry(self, retrieve):
+        self.client.force_authenticate(self.user)
+        with self.assertLogs('core.views', level='ERROR'):
+            response = self.client.post(self.url, {'requests': [
+                {'path': 'users/profile/'},
+                {'method': 'PATCH', 'path': 'users/profile/', 'body': {'first_name': 'Still'}},
+            ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.data['responses']], [500, 200])
+
+    def test_anonymous_sub_requests_are_not_authenticated(self):
+        response = self.client.post(self.url, {'requests': [{'path': 'users/profile/'}]}, format='json')
+        self.assertEqual(response.data['responses'][0]['status'], 401)
+
+    @override_settings(BATCH_MAX_REQUESTS=1)
+    def test_rejects_oversized_batches(self):
+        response = self.client.post(self.url, {'requests': [{'path': 'a/'}, {'path': 'b/'}]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(BATCH_MAX_WORKERS=4)
+class ConcurrentBatchTests(TransactionTestCase):
+    """Worker threads use their own connections, so the rows must be committed."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(email='admin@example.com', password='StrongPassword123!')
+        get_user_model().objects.create_user(email='customer@example.com', password='StrongPassword123!')
+        self.client.force_authenticate(self.admin)
+
+    def test_concurrent_reads_query_on_worker_connections(self):
+        closed_on = []
+        real_close_all = connections.close_all
+
+        def close_all():
+            closed_on.append(threading.get_ident())
+            real_close_all()
+
+        with patch('core.views.connections.close_all', side_effect=close_all):
+            response = self.client.post(reverse('batch'), {'requests': [
+                {'path': 'users/'},
+                {'path': 'users/?page_size=1'},
+                {'path': 'users/'},
+            ]}, format='json')
+        self.assertEqual([r['status'] for r in response.data['responses']], [200, 200, 200])
+        emails = {u['email'] for u in response.data['responses'][0]['body']}
+        self.assertEqual(emails, {'admin@example.com', 'customer@example.com'})
+        self.assertEqual(len(response.data['responses'][1]['body']['results']), 1)
+        # Every sub-request released its worker's connection, none of them on this thread
+        self.assertEqual(len(closed_on), 3)
+        self.assertNotIn(threading.get_ident(), closed_on)
+
+
+@override_settings(ADMISSION_CONTROL={
+    'auth': {'prefixes': ['/api/auth/'], 'limit': 2, 'queue_timeout': 0.0},
+    'api': {'prefixes': ['/api/'], 'limit': 4, 'queue_timeout': 0.5},
+}, ADMISSION_ANONYMOUS_SHARE=0.5)
+class AdmissionControlTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.get('/api/users/profile/')  # Loads the middleware and its groups
+
+    def test_sheds_over_limit_with_retry_after(self):
+        _groups['auth'].in_flight = 2
+        response = self.client.post(reverse('token_obtain_pair'), {'email': 'a@example.com', 'password': 'x'})
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(_groups['auth'].shed, 1)
+
+    @patch('core.log.SamplingFilter.filter', return_value=True)
+    def test_anonymous_share_keeps_headroom_for_valid_tokens(self, sampling):
+        user = get_user_model().objects.create_user(email='token@example.com', password='StrongPassword123!')
+        _groups['auth'].in_flight = 1
+        anonymous = self.client.post(reverse('token_obtain_pair'), {})
+        self.assertEqual(anonymous.status_code, 503)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        forged = self.client.post(reverse('token_obtain_pair'), {})
+        self.assertEqual(forged.status_code, 503)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        with self.assertLogs('users.views', level='INFO'):  # Admitted, so the view runs and logs the rejection
+            authenticated = self.client.post(reverse('token_obtain_pair'), {})
+        self.assertNotEqual(authenticated.status_code, 503)
+
+    def test_request_stale_upstream_is_shed_with_free_slots(self):
+        started = time.time() - 5
+        response = self.client.get('/api/users/profile/', HTTP_X_REQUEST_START=f't={started:.3f}')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(_groups['api'].snapshot()['in_flight'], 0)
+        self.assertEqual(_groups['api'].shed, 1)
+
+    def test_batched_auth_calls_need_an_auth_slot(self):
+        _groups['auth'].in_flight = 2
+        response = self.client.post(reverse('batch'), {'requests': [
+            {'method': 'POST', 'path': 'auth/login/', 'body': {'email': 'a@example.com', 'password': 'x'}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['responses'][0]['status'], 503)
+        self.assertEqual(_groups['auth'].shed, 1)
+
+    def test_spent_queue_budget_sheds_immediately(self):
+        _groups['api'].in_flight = 4
+        started = time.time() - 5
+        response = self.client.get('/api/users/profile/', HTTP_X_REQUEST_START=f't={started * 1000:.0f}')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(_groups['api'].snapshot()['queue_depth'], 0)
+
+    def test_metrics_are_admin_only(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='StrongPassword123!')
+        self.assertEqual(self.client.get(reverse('admission_metrics')).status_code, 401)
+        self.client.force_authenticate(admin)
+        response = self.client.get(reverse('admission_metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'auth', 'api'})
+        self.assertEqual(response.data['api']['in_flight'], 1)  # This request
+
+
+class CountingView(APIView):
+    permission_classes = [AllowAny]
+    calls = 0
+    status_code = 201
+
+    @idempotent
+    def post(self, request):
+        CountingView.calls += 1
+        return Response({'call': CountingView.calls}, status=self.status_code)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        CountingView.calls = 0
+        self.factory = APIRequestFactory()
+
+    def post(self, key='key-1', data=None, view=CountingView):
+        request = self.factory.post('/api/things/', data or {'a': 1}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+        return view.as_view()(request)
+
+    def multipart_post(self, boundary, content=b'%PDF-1.4 prescription'):
+        upload = SimpleUploadedFile('rx.pdf', content, content_type='application/pdf')
+        body = encode_multipart(boundary, {'note': 'urgent', 'file': upload})
+        request = self.factory.post('/api/things/', body, content_type=f'multipart/form-data; boundary={boundary}',
+                                    HTTP_IDEMPOTENCY_KEY='upload-1')
+        return CountingView.as_view()(request)
+
+    def test_multipart_retry_with_new_boundary_is_replayed(self):
+        self.multipart_post('BoUnDaRyOne')
+        response = self.multipart_post('BoUnDaRyTwo')
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.assertEqual(CountingView.calls, 1)
+
+        other_file = self.multipart_post('BoUnDaRyThree', content=b'%PDF-1.4 another prescription')
+        self.assertEqual(other_file.status_code, 422)
+
+    def test_requests_without_key_always_run(self):
+        view = CountingView.as_view()
+        view(self.factory.post('/api/things/', {}, format='json'))
+        view(self.factory.post('/api/things/', {}, format='json'))
+        self.assertEqual(CountingView.calls, 2)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0)
+    def test_duplicate_of_in_flight_request_gets_conflict(self):
+        self.post()
+        IdempotencyRecord.objects.update(status=IdempotencyRecord.IN_PROGRESS)
+        response = self.post()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(CountingView.calls, 1)
+
+    def test_abandoned_in_flight_request_is_taken_over(self):
+        self.post()
+        IdempotencyRecord.objects.update(status=IdempotencyRecord.IN_PROGRESS,
+                                         created_at=timezone.now() - timedelta(minutes=5))
+        response = self.post()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {'call': 2})
+        self.assertEqual(IdempotencyRecord.objects.get().status, IdempotencyRecord.COMPLETED)
+
+    def test_server_errors_are_not_stored(self):
+        class FailingView(CountingView):
+            status_code = 503
+        self.post(view=FailingView)
+        self.post(view=FailingView)
+        self.assertEqual(CountingView.calls, 2)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+    def test_expired_records_run_again_and_are_purged(self):
+        self.post()
+        IdempotencyRecord.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post()
+        self.assertEqual(response.data, {'call': 2})
+
+        IdempotencyRecord.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        call_command('purge_idempotency_keys', stdout=io.StringIO())
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+        self.css = os.path.join(self.static_root, 'app.0123456789ab.css')
+        with open(self.css, 'w') as f:
+            f.write('body { color: #333; }\n' * 200)
+
+    def test_compress_file_writes_smaller_gzip_variant(self):
+        written = compress_file(self.css)
+        self.assertIn(self.css + '.gz', written)
+        with gzip.open(self.css + '.gz', 'rb') as f, open(self.css, 'rb') as original:
+            self.assertEqual(f.read(), original.read())
+
+    def test_serves_precompressed_hashed_files_as_immutable(self):
+        compress_file(self.css)
+        storage = SimpleNamespace(hashed_files={'app.css': 'app.0123456789ab.css'})
+        with override_settings(SERVE_STATIC=True, STATIC_ROOT=self.static_root), \
+                patch('core.middleware.staticfiles_storage', storage):
+            response = self.client.get('/static/app.0123456789ab.css', HTTP_ACCEPT_ENCODING='gzip, deflate')
+            plain = self.client.get('/static/app.0123456789ab.css')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('filename="app.0123456789ab.css"', response['Content-Disposition'])
+
+    def test_refused_encodings_are_not_served(self):
+        compress_file(self.css)
+        with override_settings(SERVE_STATIC=True, STATIC_ROOT=self.static_root):
+            refused = self.client.get('/static/app.0123456789ab.css', HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+            wildcard = self.client.get('/static/app.0123456789ab.css', HTTP_ACCEPT_ENCODING='*;q=0.5')
+            substring = self.client.get('/static/app.0123456789ab.css', HTTP_ACCEPT_ENCODING='x-gzipped')
+        self.assertFalse(refused.has_header('Content-Encoding'))
+        self.assertIn(wildcard['Content-Encoding'], ('br', 'gzip'))
+        self.assertFalse(substring.has_header('Content-Encoding'))
+
+    def test_only_large_api_responses_are_gzipped(self):
+        user_model = get_user_model()
+        admin = user_model.objects.create_superuser(email='admin@example.com', password='StrongPassword123!')
+        user_model.objects.bulk_create([user_model(email=f'user{i}@example.com') for i in range(50)])
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        large = client.get(reverse('user_list'), HTTP_ACCEPT_ENCODING='gzip')
+        small = client.get(reverse('user_profile'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(large['Content-Encoding'], 'gzip')
+        self.assertFalse(small.has_header('Content-Encoding'))
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import BatchView, AdmissionMetricsView
+
+urlpatterns = [
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('metrics/admission/', AdmissionMetricsView.as_view(), name='admission_metrics'),
+]
@@ -0,0 +1,148 @@
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .middleware import admission_snapshot, overloaded_response, route_group
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/'
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class BatchView(APIView):
+    """
+    Run several API calls in one round trip.
+
+    Body: {"requests": [{"method": "GET", "path": "users/profile/", "body": {...}}, ...]}
+    Paths are relative to /api/. The caller is authenticated once and that user
+    is handed to every sub-request; each sub-view still applies its own
+    permissions and throttles. Sub-requests run on the request thread and
+    share its DB connection, in the order given; with BATCH_MAX_WORKERS > 1,
+    runs of consecutive reads execute concurrently instead, each on its own
+    connection. An unexpected error fails only its own entry, with status 500.
+    A sub-request in a different admission group than the batch (e.g. auth/)
+    must also get a slot in that group, or its entry is shed with 503.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({"error": "'requests' must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {"error": f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Consecutive reads may run concurrently; a write waits for the reads
+        # before it and runs alone, so the batch observes the order the client sent.
+        results = [None] * len(items)
+        pending_reads = []
+        for index, item in enumerate(items):
+            method = str(item.get('method', 'GET')).upper() if isinstance(item, dict) else None
+            if method in READ_METHODS:
+                pending_reads.append(index)
+                continue
+            self._run_reads(request, items, pending_reads, results)
+            pending_reads = []
+            results[index] = self._run(request, item)
+        self._run_reads(request, items, pending_reads, results)
+
+        return Response({"responses": results}, status=status.HTTP_200_OK)
+
+    def _run_reads(self, request, items, indexes, results):
+        if len(indexes) > 1 and settings.BATCH_MAX_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=min(settings.BATCH_MAX_WORKERS, len(indexes))) as pool:
+                for index, result in zip(indexes, pool.map(lambda i: self._run_in_thread(request, items[i]), indexes)):
+                    results[index] = result
+        else:
+            for index in indexes:
+                results[index] = self._run(request, items[index])
+
+    def _run_in_thread(self, request, item):
+        try:
+            return self._run(request, item)
+        finally:
+            # Worker threads get their own connections; don't leak them
+            connections.close_all()
+
+    def _run(self, request, item):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return {"status": status.HTTP_400_BAD_REQUEST, "body": {"error": "Each request needs a 'path'."}}
+
+        path, _, query = item['path'].partition('?')
+        path = API_PREFIX + path.lstrip('/').removeprefix(API_PREFIX.lstrip('/'))
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return {"status": status.HTTP_404_NOT_FOUND, "body": {"error": f"No API endpoint at {path}."}}
+        if getattr(match.func, 'view_class', None) is BatchView:
+            return {"status": status.HTTP_400_BAD_REQUEST, "body": {"error": "Batches cannot be nested."}}
+
+        body = json.dumps(item['body']).encode() if item.get('body') is not None else b''
+        environ = {
+            key: value for key, value in request.META.items()
+            if key not in ('CONTENT_LENGTH', 'CONTENT_TYPE', 'QUERY_STRING', 'wsgi.input')
+        }
+        environ.update({
+            'REQUEST_METHOD': str(item.get('method', 'GET')).upper(),
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+        })
+        sub_request = WSGIRequest(environ)
+        if request.user.is_authenticated:
+            # Picked up by DRF instead of re-running JWT authentication
+            sub_request._force_auth_user = request.user
+            sub_request._force_auth_token = request.auth
+
+        # The middleware only admitted the batch itself; sub-requests to another
+        # group (auth/ does password hashing) must not ride on the batch's slot
+        group = route_group(path)
+        if group is not None and group is not route_group(request.path_info):
+            if not group.acquire(request.user.is_authenticated):
+                return self._entry(overloaded_response())
+            try:
+                return self._dispatch(match, sub_request)
+            finally:
+                group.release()
+        return self._dispatch(match, sub_request)
+
+    def _dispatch(self, match, sub_request):
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Batch sub-request %s %s failed", sub_request.method, sub_request.path_info)
+            return {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "body": {"error": "Internal server error."}}
+        return self._entry(response)
+
+    def _entry(self, response):
+        if hasattr(response, 'data'):
+            data = response.data
+        else:
+            content = response.content.decode(response.charset or 'utf-8')
+            try:
+                data = json.loads(content) if content else None
+            except ValueError:
+                data = content
+        return {"status": response.status_code, "body": data}
+
+
+class AdmissionMetricsView(APIView):
+    """In-flight, queue depth, admitted and shed counts per route group for this worker."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(admission_snapshot())
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'kind', 'created_at', 'sent_at', 'attempts')
+    list_filter = ('kind',)
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('user__email',)
@@ -0,0 +1,91 @@
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import groupby
+from django.conf import settings
+from django.db.models import F, Min
+from django.utils import timezone
+from .models import Notification
+from .transports import get_transport
+
+
+@dataclass
+class DispatchResult:
+    users: int = 0
+    sent: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+def enqueue(user, kind, **payload):
+    """Queue a notification; `payload['message']` is the line shown to the customer."""
+    return Notification.objects.create(user=user, kind=kind, payload=payload)
+
+
+def render(notifications):
+    """Coalesce one user's pending notifications into a single subject and body."""
+    lines = [n.payload.get('message', n.kind) for n in notifications]
+    if len(lines) == 1:
+        subject = notifications[0].payload.get('subject', 'Mahmood Pharmacy update')
+    else:
+        subject = f'Mahmood Pharmacy: {len(lines)} updates'
+    return subject, '\n'.join(lines)
+
+
+def dispatch_pending(transport=None, now=None):
+    """
+    Send one batch. Users whose oldest pending notification is older than
+    NOTIFICATION_COALESCE_SECONDS get a single message covering everything
+    pending for them; newer bursts wait so they can be merged. Meant to run
+    from one scheduled dispatcher process.
+    """
+    started = time.monotonic()
+    now = now or timezone.now()
+    transport = transport or get_transport()
+    cutoff = now - timedelta(seconds=settings.NOTIFICATION_COALESCE_SECONDS)
+
+    pending = Notification.objects.filter(sent_at__isnull=True, attempts__lt=settings.NOTIFICATION_MAX_ATTEMPTS)
+    user_ids = list(
+        pending.values('user_id')
+        .annotate(oldest=Min('created_at'))
+        .filter(oldest__lte=cutoff)
+        .order_by('oldest')
+        .values_list('user_id', flat=True)[:settings.NOTIFICATION_BATCH_SIZE]
+    )
+    if not user_ids:
+        return DispatchResult(seconds=time.monotonic() - started)
+
+    rows = pending.filter(user_id__in=user_ids).select_related('user').order_by('user_id', 'created_at')
+    groups = [(user_id, list(items)) for user_id, items in groupby(rows, key=lambda n: n.user_id)]
+    messages = [(items[0].user, *render(items)) for _, items in groups]
+
+    try:
+        delivered = {user.pk for user in transport.send_batch(messages)}
+        error = "Delivery failed"
+    except Exception as e:
+        delivered, error = set(), str(e)
+
+    sent_ids = [n.pk for user_id, items in groups if user_id in delivered for n in items]
+    failed_ids = [n.pk for user_id, items in groups if user_id not in delivered for n in items]
+    Notification.objects.filter(pk__in=sent_ids).update(sent_at=now)
+    Notification.objects.filter(pk__in=failed_ids).update(attempts=F('attempts') + 1, last_error=error)
+
+    return DispatchResult(
+        users=len(groups),
+        sent=len(sent_ids),
+        failed=len(failed_ids),
+        seconds=time.monotonic() - started,
+    )
+
+
+def queue_metrics(now=None):
+    """Backlog size and age, plus notifications that ran out of attempts."""
+    now = now or timezone.now()
+    unsent = Notification.objects.filter(sent_at__isnull=True)
+    pending = unsent.filter(attempts__lt=settings.NOTIFICATION_MAX_ATTEMPTS)
+    oldest = pending.aggregate(oldest=Min('created_at'))['oldest']
+    return {
+        'backlog': pending.count(),
+        'oldest_pending_seconds': (now - oldest).total_seconds() if oldest else 0,
+        'failed': unsent.filter(attempts__gte=settings.NOTIFICATION_MAX_ATTEMPTS).count(),
+    }
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from notifications.dispatcher import dispatch_pending, queue_metrics
+
+
+class Command(BaseCommand):
+    help = "Send pending notifications in coalesced batches and report throughput and backlog."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep dispatching until interrupted.")
+        parser.add_argument('--interval', type=float, default=10, help="Seconds between batches with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            result = dispatch_pending()
+            metrics = queue_metrics()
+            rate = result.sent / result.seconds if result.seconds else 0
+            self.stdout.write(
+                f"users={result.users} sent={result.sent} failed={result.failed} "
+                f"rate={rate:.0f}/s backlog={metrics['backlog']} "
+                f"oldest={metrics['oldest_pending_seconds']:.0f}s exhausted={metrics['failed']}"
+            )
+            if not options['loop']:
+                break
+            # Drain a backlog back to back; otherwise wait for the next tick
+            if not result.users:
+                time.sleep(options['interval'])
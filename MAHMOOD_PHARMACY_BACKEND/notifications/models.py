@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import models
+
+
+class Notification(models.Model):
+    """
+    A pending customer notification (e.g. an order or prescription status
+    change). Rows are the dispatch queue: `sent_at` stays empty until the
+    dispatcher has delivered them.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # Dispatcher scans unsent rows oldest first
+            models.Index(fields=['sent_at', 'created_at'], name='notification_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} for {self.user_id}'
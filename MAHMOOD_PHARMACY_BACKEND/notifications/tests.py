@@ -0,0 +1,62 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .dispatcher import dispatch_pending, enqueue, queue_metrics
+from .models import Notification
+from .transports import BaseTransport
+
+User = get_user_model()
+
+
+class FailingTransport(BaseTransport):
+    def send_batch(self, messages):
+        raise ConnectionError("SMTP unavailable")
+
+
+@override_settings(NOTIFICATION_COALESCE_SECONDS=60)
+class DispatcherTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(email='alice@example.com', password='StrongPassword123!')
+        self.bob = User.objects.create_user(email='bob@example.com', password='StrongPassword123!')
+        self.later = timezone.now() + timedelta(seconds=61)
+
+    def test_coalesces_per_user_and_sends_one_batch(self):
+        for status in ('confirmed', 'packed', 'out for delivery'):
+            enqueue(self.alice, 'order_status', message=f'Order #1 is {status}')
+        enqueue(self.bob, 'prescription_status', message='Prescription approved')
+
+        result = dispatch_pending(now=self.later)
+        self.assertEqual((result.users, result.sent, result.failed), (2, 4, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        alice_mail = next(m for m in mail.outbox if m.to == ['alice@example.com'])
+        self.assertEqual(alice_mail.subject, 'Mahmood Pharmacy: 3 updates')
+        self.assertIn('out for delivery', alice_mail.body)
+        self.assertFalse(Notification.objects.filter(sent_at__isnull=True).exists())
+
+    def test_recent_bursts_wait_for_the_window(self):
+        enqueue(self.alice, 'order_status', message='Order #1 is confirmed')
+        result = dispatch_pending()
+        self.assertEqual(result.sent, 0)
+        self.assertEqual(queue_metrics()['backlog'], 1)
+
+    @override_settings(NOTIFICATION_MAX_ATTEMPTS=2)
+    def test_failures_are_retried_then_reported(self):
+        enqueue(self.alice, 'order_status', message='Order #1 is confirmed')
+        for _ in range(2):
+            result = dispatch_pending(transport=FailingTransport(), now=self.later)
+            self.assertEqual(result.failed, 1)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.last_error, 'SMTP unavailable')
+        self.assertEqual(queue_metrics(), {'backlog': 0, 'oldest_pending_seconds': 0, 'failed': 1})
+
+    def test_metrics_endpoint_is_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        self.assertEqual(client.get(reverse('notification_metrics')).status_code, 403)
+        client.force_authenticate(User.objects.create_superuser(email='admin@example.com', password='StrongPassword123!'))
+        response = client.get(reverse('notification_metrics'))
+        self.assertEqual(response.data['backlog'], 0)
@@ -0,0 +1,49 @@
+import logging
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def get_transport():
+    return import_string(settings.NOTIFICATION_TRANSPORT)()
+
+
+class BaseTransport:
+    """
+    Delivers a batch of (user, subject, body) messages and returns the users
+    whose message was sent. Raising marks the whole batch as failed.
+    """
+    def send_batch(self, messages):
+        raise NotImplementedError
+
+
+class EmailTransport(BaseTransport):
+    """
+    Sends the batch over a single connection of the configured EMAIL_BACKEND
+    (SMTP in production; console, file or locmem backends in dev and tests).
+    """
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    def send_batch(self, messages):
+        from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@mahmoodpharmacy.com')
+        sent = []
+        with get_connection(self.backend) as connection:
+            for user, subject, body in messages:
+                try:
+                    connection.send_messages([EmailMessage(subject, body, from_email, [user.email])])
+                except Exception:
+                    logger.exception("Failed to send notification email to %s", user.email)
+                else:
+                    sent.append(user)
+        return sent
+
+
+class LogTransport(BaseTransport):
+    """Writes messages to the log instead of delivering them."""
+    def send_batch(self, messages):
+        for user, subject, body in messages:
+            logger.info("Notification for %s: %s | %s", user.email, subject, body)
+        return [user for user, _, _ in messages]
@@ -0,0 +1,12 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .dispatcher import queue_metrics
+
+
+class NotificationMetricsView(APIView):
+    """Notification backlog size and age, and notifications that ran out of attempts."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(queue_metrics())
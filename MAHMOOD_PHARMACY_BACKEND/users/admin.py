@@ -1,14 +1,112 @@
+import hashlib
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR, PAGE_VAR
 from django.contrib.auth.admin import UserAdmin
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import User
 from django.utils.translation import gettext_lazy as _
 
+# Seconds exact changelist and facet counts are reused
+ADMIN_COUNT_CACHE_TIMEOUT = 60
+# Below this many rows the planner estimate is too rough; count exactly instead
+ESTIMATED_COUNT_THRESHOLD = 10000
+# Query parameter carrying the last email of the previous page
+KEYSET_VAR = 'after'
+
+
+def _count_cache_key(prefix, queryset):
+    return f'admin:{prefix}:' + hashlib.md5(str(queryset.query).encode()).hexdigest()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the planner's row estimate for unfiltered PostgreSQL
+    tables and otherwise caches the exact COUNT(*) for a short while.
+    """
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] >= ESTIMATED_COUNT_THRESHOLD:
+                    return row[0]
+
+        key = _count_cache_key('count', queryset)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, ADMIN_COUNT_CACHE_TIMEOUT)
+        return count
+
+
+class CachedBooleanFieldListFilter(admin.BooleanFieldListFilter):
+    """BooleanFieldListFilter whose facet counts are cached per filtered query."""
+    def get_facet_queryset(self, changelist):
+        filtered_qs = changelist.get_queryset(self.request, exclude_parameters=self.expected_parameters())
+        key = _count_cache_key(f'facets:{self.field_path}', filtered_qs)
+        counts = cache.get(key)
+        if counts is None:
+            counts = filtered_qs.aggregate(**self.get_facet_counts(changelist.pk_attname, filtered_qs))
+            cache.set(key, counts, ADMIN_COUNT_CACHE_TIMEOUT)
+        return counts
+
+
+class UserChangeList(ChangeList):
+    """
+    Loads only the listed columns and supports keyset paging on email
+    (`?after=<email>`) so deep pages avoid large OFFSET scans. The cursor
+    only narrows the page listing; the total and facet counts still cover
+    the whole filtered list.
+    """
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(*self._listed_columns())
+
+    def _listed_columns(self):
+        # Methods and callables in list_display have no column to load
+        columns = []
+        for name in self.list_display:
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.append(name)
+        return columns
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.keyset_after = getattr(request, 'keyset_after', None)
+        if self.keyset_after:
+            # The page super() picked is a lazy slice, so replacing it costs no query
+            self.result_list = self.queryset.filter(email__gt=self.keyset_after)[:self.list_per_page]
+        self.keyset_next_url = None
+        # Keyset paging is only valid for the default email ordering
+        results = list(self.result_list)
+        if ORDER_VAR not in self.params and self.multi_page and len(results) == self.list_per_page:
+            self.keyset_next_url = self.get_query_string({KEYSET_VAR: results[-1].email}, [PAGE_VAR])
+
+
 class CustomUserAdmin(UserAdmin):
     model = User
     list_display = ('email', 'first_name', 'last_name', 'is_staff', 'is_active')
-    list_filter = ('is_staff', 'is_active')
+    list_filter = (('is_staff', CachedBooleanFieldListFilter), ('is_active', CachedBooleanFieldListFilter))
     search_fields = ('email', 'first_name', 'last_name')
     ordering = ('email',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Skip the second, unfiltered COUNT(*)
 
     # Custom fieldsets without 'username'
     fieldsets = (
@@ -40,5 +138,15 @@ class CustomUserAdmin(UserAdmin):
         ),
     )
 
+    def get_changelist(self, request, **kwargs):
+        return UserChangeList
+
+    def changelist_view(self, request, extra_context=None):
+        # Take the keyset cursor out of GET so the changelist doesn't treat it as a filter
+        if KEYSET_VAR in request.GET:
+            request.GET = request.GET.copy()
+            request.keyset_after = request.GET.pop(KEYSET_VAR)[-1]
+        return super().changelist_view(request, extra_context)
+
 admin.site.register(User, CustomUserAdmin)
 
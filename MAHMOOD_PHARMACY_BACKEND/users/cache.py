@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.cache import cache
+
+PROFILE_CACHE_KEY = 'users:profile:{}'
+
+
+def get_cached_profile(user):
+    """
+    Return the profile read model for `user`, serializing and caching it on a miss.
+    Entries are dropped when a User.save() commits, so the cache never outlives a write.
+    """
+    key = PROFILE_CACHE_KEY.format(user.pk)
+    data = cache.get(key)
+    if data is None:
+        from .serializers import UserProfileSerializer
+        data = dict(UserProfileSerializer(user).data)
+        cache.set(key, data, settings.PROFILE_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_profile(user_id):
+    cache.delete(PROFILE_CACHE_KEY.format(user_id))
@@ -1,8 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 from .managers import CustomUserManager
+from .cache import invalidate_profile
 
 class User(AbstractUser):
     username = None  # Remove username field
@@ -24,9 +25,25 @@ class User(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Backs cursor pagination of the user list
+            models.Index(fields=['-date_joined', '-id'], name='user_joined_id_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         self.email = self.email.lower()
         super().save(*args, **kwargs)
+        # Drop the cached profile only once the row is visible to other
+        # requests, or a concurrent read could re-cache the old values
+        pk = self.pk
+        transaction.on_commit(lambda: invalidate_profile(pk), using=kwargs.get('using'))
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(lambda: invalidate_profile(pk), using=kwargs.get('using'))
+        return result
 
     def __str__(self):
         return self.email
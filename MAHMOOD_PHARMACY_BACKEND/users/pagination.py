@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (date_joined, id), newest first. Only applied when the
+    client sends `cursor` or `page_size`, so existing clients keep receiving a
+    plain list.
+    """
+    ordering = ('-date_joined', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
@@ -15,26 +16,26 @@ User = get_user_model()
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         email = attrs.get('email')
-        logger.debug(f"[{self.__class__.__name__}] Starting validation for email: {email}")
+        logger.debug("[%s] Starting validation for email: %s", self.__class__.__name__, email)
 
         try:
             # Attempt to validate using the parent class's method
             # This will raise AuthenticationFailed if user is inactive or credentials are bad
             validated_data = super().validate(attrs)
-            logger.debug(f"[{self.__class__.__name__}] super().validate(attrs) successful for email: {email}")
+            logger.debug("[%s] super().validate(attrs) successful for email: %s", self.__class__.__name__, email)
             return validated_data
         except AuthenticationFailed as e:
-            logger.debug(f"[{self.__class__.__name__}] AuthenticationFailed caught for email: {email}. Default Code: {e.default_code}, Detail: {e.detail}")
+            logger.debug("[%s] AuthenticationFailed caught for email: %s. Default Code: %s, Detail: %s", self.__class__.__name__, email, e.default_code, e.detail)
 
             # Check if the specific error is for an inactive user
             # 'no_active_account' is the code Simple JWT uses for inactive users
             if e.default_code == 'no_active_account':
                 user = User.objects.filter(email__iexact=email).first()
-                logger.debug(f"[{self.__class__.__name__}] User found after 'no_active_account' error: {bool(user)}, Is active: {user.is_active if user else 'N/A'}")
+                logger.debug("[%s] User found after 'no_active_account' error: %s, Is active: %s", self.__class__.__name__, bool(user), user.is_active if user else 'N/A')
 
                 # Double-check that the user exists and is indeed inactive
                 if user and not user.is_active:
-                    logger.debug(f"[{self.__class__.__name__}] Inactive user identified: {email}. Resending OTP.")
+                    logger.debug("[%s] Inactive user identified: %s. Resending OTP.", self.__class__.__name__, email)
                     # Resend OTP logic
                     otp = generate_otp()
                     user.otp_code = otp
@@ -44,21 +45,21 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
                     try:
                         send_otp_email(user.email, otp)
-                        logger.debug(f"[{self.__class__.__name__}] OTP email sent to {user.email}.")
+                        logger.debug("[%s] OTP email sent to %s.", self.__class__.__name__, user.email)
                     except Exception as email_exc:
-                        logger.error(f"[{self.__class__.__name__}] Failed to send OTP email to {user.email}: {email_exc}")
+                        logger.error("[%s] Failed to send OTP email to %s: %s", self.__class__.__name__, user.email, email_exc)
                     
                     # Raise a custom AuthenticationFailed to be caught by the view
-                    logger.debug(f"[{self.__class__.__name__}] Raising custom AuthenticationFailed for inactive user {email}.")
+                    logger.debug("[%s] Raising custom AuthenticationFailed for inactive user %s.", self.__class__.__name__, email)
                     raise AuthenticationFailed(
                         'User is not active. A new OTP has been sent.',
                         'unverified_user'
                     )
                 else:
-                    logger.debug(f"[{self.__class__.__name__}] 'no_active_account' error but user not found or is active: {email}. Re-raising original exception.")
+                    logger.debug("[%s] 'no_active_account' error but user not found or is active: %s. Re-raising original exception.", self.__class__.__name__, email)
                     raise e # Re-raise if not an inactive user
             else:
-                logger.debug(f"[{self.__class__.__name__}] AuthenticationFailed was not 'no_active_account' (code: {e.default_code}) for {email}. Re-raising original exception.")
+                logger.debug("[%s] AuthenticationFailed was not 'no_active_account' (code: %s) for %s. Re-raising original exception.", self.__class__.__name__, e.default_code, email)
                 raise e # Re-raise if it's another type of AuthenticationFailed
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -79,6 +80,29 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         )
         return user
 
+class UserProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('email', 'first_name', 'last_name', 'mobile')
+
+    def to_internal_value(self, data):
+        # On PATCH, drop values that match what is stored so unchanged fields
+        # skip validation (e.g. the email uniqueness query).
+        if self.partial and self.instance is not None and isinstance(data, Mapping):
+            data = {
+                field: data[field] for field in data
+                if field not in self.fields or data[field] != getattr(self.instance, field)
+            }
+        return super().to_internal_value(data)
+
+    def update(self, instance, validated_data):
+        changed = [attr for attr, value in validated_data.items() if getattr(instance, attr) != value]
+        for attr in changed:
+            setattr(instance, attr, validated_data[attr])
+        if changed:
+            instance.save(update_fields=changed)
+        return instance
+
 class VerifyOTPSerializer(serializers.Serializer):
     email = serializers.EmailField()
     otp_code = serializers.CharField(
@@ -8,6 +8,8 @@ from django.utils import timezone
 from datetime import timedelta
 from unittest.mock import patch
 from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 User = get_user_model()
 
@@ -98,6 +100,19 @@ class AuthTests(TestCase):
             self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
             self.assertEqual(User.objects.count(), 0) # Should be 0 due to atomic rollback
 
+    def test_registration_retry_with_idempotency_key_is_replayed(self):
+        first = self.client.post(self.register_url, self.user_data, HTTP_IDEMPOTENCY_KEY='reg-1')
+        retry = self.client.post(self.register_url, self.user_data, HTTP_IDEMPOTENCY_KEY='reg-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(len(mail.outbox), 1)  # No second OTP email
+
+        self.user_data['first_name'] = 'Other'
+        reused = self.client.post(self.register_url, self.user_data, HTTP_IDEMPOTENCY_KEY='reg-1')
+        self.assertEqual(reused.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
     def test_duplicate_email_registration(self):
         self.client.post(self.register_url, self.user_data)
         response = self.client.post(self.register_url, self.user_data)
@@ -109,3 +124,142 @@ class AuthTests(TestCase):
         self.user_data['password'] = '123'
         response = self.client.post(self.register_url, self.user_data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class ProfileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.profile_url = reverse('user_profile')
+        self.user = User.objects.create_user(
+            email='profile@example.com',
+            password='StrongPassword123!',
+            first_name='Pro',
+            last_name='File',
+            mobile='+1234567890',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_profile_read_is_cached_until_write(self):
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'profile@example.com')
+        self.assertNotIn('password', response.data)
+
+        with patch('users.serializers.UserProfileSerializer.to_representation') as to_representation:
+            self.client.get(self.profile_url)
+            to_representation.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.profile_url, {'first_name': 'Changed'}, format='json')
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['first_name'], 'Changed')
+
+    def test_cache_is_invalidated_only_after_commit(self):
+        self.client.get(self.profile_url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.first_name = 'Uncommitted'
+            self.user.save()
+            # The transaction is still open, so the cached row stays
+            self.assertEqual(self.client.get(self.profile_url).data['first_name'], 'Pro')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(self.profile_url).data['first_name'], 'Uncommitted')
+
+    def test_patch_writes_only_changed_columns(self):
+        data = {'email': self.user.email, 'mobile': '+1987654321'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.profile_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # No uniqueness lookup for the unchanged email, one narrow UPDATE
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertTrue(sql.startswith('UPDATE'))
+        self.assertIn('"mobile"', sql)
+        self.assertNotIn('"password"', sql)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.mobile, '+1987654321')
+
+    def test_patch_with_taken_email_is_rejected(self):
+        User.objects.create_user(email='taken@example.com', password='StrongPassword123!')
+        response = self.client.patch(self.profile_url, {'email': 'taken@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(email='admin@example.com', password='StrongPassword123!')
+        for i in range(5):
+            User.objects.create_user(email=f'user{i}@example.com', password='StrongPassword123!')
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:users_user_changelist')
+
+    @patch('users.admin.CustomUserAdmin.list_per_page', 2)
+    def test_keyset_next_page(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cl = response.context['cl']
+        self.assertEqual([u.email for u in cl.result_list], ['admin@example.com', 'user0@example.com'])
+        self.assertIn('after=user0%40example.com', cl.keyset_next_url)
+        self.assertContains(response, 'Next page')
+        self.assertContains(response, '?p=2')
+
+        response = self.client.get(self.url + cl.keyset_next_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        emails = [u.email for u in response.context['cl'].result_list]
+        self.assertEqual(emails, ['user1@example.com', 'user2@example.com'])
+        # The cursor narrows the listing only, not the total or the facet counts
+        self.assertEqual(response.context['cl'].result_count, 6)
+        facets = self.client.get(self.url + cl.keyset_next_url + '&_facets=True')
+        staff_filter = facets.context['cl'].filter_specs[0]
+        counts = [choice['display'] for choice in staff_filter.choices(facets.context['cl'])]
+        self.assertIn('No (5)', counts)
+        # Numbered links would drop the cursor, so only "Next page" is offered
+        self.assertNotContains(response, '?p=')
+        self.assertContains(response, 'Next page')
+
+    @patch('users.admin.CustomUserAdmin.list_display', ('email', '__str__', 'is_active'))
+    def test_projection_skips_non_column_list_display_entries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['cl']._listed_columns(), ['email', 'is_active'])
+
+    def test_counts_are_cached_and_columns_projected(self):
+        self.client.get(self.url + '?_facets=True')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + '?_facets=True')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sql = [q['sql'] for q in queries]
+        self.assertFalse(any('COUNT(' in q for q in sql))
+        listing = [q for q in sql if 'ORDER BY' in q and '"users_user"."email" ASC' in q]
+        self.assertTrue(listing)
+        self.assertNotIn('"otp_code"', listing[0])
+
+class UserListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(email='admin@example.com', password='StrongPassword123!')
+        for i in range(4):
+            User.objects.create_user(email=f'user{i}@example.com', password='StrongPassword123!')
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('user_list')
+
+    def test_plain_list_without_cursor_params(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(set(response.data[0]), {'email', 'first_name', 'last_name', 'mobile'})
+
+    def test_cursor_pagination_walks_newest_first(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual([u['email'] for u in response.data['results']], ['user3@example.com', 'user2@example.com'])
+
+        seen = [u['email'] for u in response.data['results']]
+        next_url = response.data['next']
+        while next_url:
+            response = self.client.get(next_url)
+            seen += [u['email'] for u in response.data['results']]
+            next_url = response.data['next']
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen[-1], 'admin@example.com')
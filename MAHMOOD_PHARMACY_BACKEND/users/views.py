@@ -1,23 +1,26 @@
 import logging
-from django.shortcuts import render
-from rest_framework import viewsets, status, generics
+from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.throttling import ScopedRateThrottle
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.exceptions import APIException # Import APIException
+from core.idempotency import idempotent
 from .serializers import (
     UserRegistrationSerializer, 
     VerifyOTPSerializer, 
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
-    CustomTokenObtainPairSerializer
+    CustomTokenObtainPairSerializer,
+    UserProfileSerializer
 )
 from .utils import generate_otp, send_otp_email
+from .cache import get_cached_profile
+from .pagination import OptionalCursorPagination
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +30,9 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
     def handle_exception(self, exc):
-        logger.error(f"CustomTokenObtainPairView: Handling exception: {exc.__class__.__name__} - {exc}")
+        # Rejected logins are routine; only unexpected errors are logged as errors
+        log = logger.info if isinstance(exc, APIException) else logger.error
+        log("CustomTokenObtainPairView: Handling exception: %s - %s", exc.__class__.__name__, exc)
         
         # Determine status code
         status_code = getattr(exc, 'status_code', status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -74,7 +79,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
             
         response = Response(error_data, status=status_code)
         
-        logger.debug(f"CustomTokenObtainPairView: Final error response: {response.data}, Status: {response.status_code}")
+        logger.debug("CustomTokenObtainPairView: Final error response: %s, Status: %s", response.data, response.status_code)
         return response
 
 class RegisterView(APIView):
@@ -82,6 +87,7 @@ class RegisterView(APIView):
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = 'otp'
 
+    @idempotent
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
@@ -206,14 +212,17 @@ class PasswordResetConfirmView(APIView):
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
-    serializer_class = UserRegistrationSerializer # Reuse or create specific profile serializer
+    serializer_class = UserProfileSerializer
 
     def get_object(self):
         return self.request.user
-    
-    # Restrict update fields if necessary by using a different serializer
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(get_cached_profile(request.user))
 
 class UserListView(generics.ListAPIView):
     permission_classes = [IsAdminUser]
-    queryset = User.objects.all()
-    serializer_class = UserRegistrationSerializer
+    # Load only the columns the list renders (plus the cursor ordering)
+    queryset = User.objects.only('id', 'email', 'first_name', 'last_name', 'mobile', 'date_joined')
+    serializer_class = UserProfileSerializer
+    pagination_class = OptionalCursorPagination